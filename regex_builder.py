@@ -1,36 +1,258 @@
+import io
 import re
 import streamlit as st
-from collections import defaultdict
+from itertools import groupby
+from urllib.parse import urlsplit
+
+# RE2 (pip install pyre2) matches large alternations in guaranteed linear
+# time with no backtracking blowup. It doesn't support lookarounds, but the
+# tester only compiles the positive pattern (negation is applied to the
+# match result), so it's a drop-in. Fall back to the stdlib engine when it
+# isn't installed or doesn't accept stdlib flag ints (google-re2's compile
+# takes an re2.Options object instead, and would blow up on IGNORECASE).
+try:
+    import re2 as _re
+    _re.compile("a", re.IGNORECASE)
+except Exception:
+    _re = re
+
+# Aho–Corasick (pip install pyahocorasick) finds any-of-N substrings in one
+# pass with no backtracking; used by the tester when both wildcards are on.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Numba, when installed, JIT-compiles the pure-string prefix strip below
+# (the urlsplit and translate stages aren't nopython-compatible).
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def _strip_prefix(url, probe, https_prefix, http_prefix):
+    """
+    Slice a matching ``http(s)://domain`` prefix off ``url``.
+
+    Args:
+        url (str): URL to strip (original casing).
+        probe (str): ``url``, lowercased when matching case-insensitively.
+        https_prefix (str): ``https://`` + domain.
+        http_prefix (str): ``http://`` + domain.
+
+    Returns:
+        tuple: ``(stripped, matched)`` — the path with any leading
+        slashes removed, and whether a prefix matched.
+    """
+    if probe.startswith(https_prefix):
+        n = len(https_prefix)
+    elif probe.startswith(http_prefix):
+        n = len(http_prefix)
+    else:
+        return url, False
+    return url[n:].lstrip("/"), True
+
+if numba is not None:
+    _strip_prefix = numba.njit(cache=True)(_strip_prefix)
+
+# Translation table escaping every regex metacharacter in one C-level pass,
+# instead of per-character re.escape. "/" is not a metacharacter in Python
+# regexes and is left alone; see the escape_slashes flag on build_regex.
+_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in ".^$*+?()[]{}|\\"})
+
+@st.cache_resource(show_spinner=False)
+def get_domain_stripper(domain, case_sensitive):
+    """
+    Compile (and cache across reruns) the regex that strips the protocol
+    and domain from a URL.
+
+    Args:
+        domain (str): Domain to strip from the URLs.
+        case_sensitive (bool): Make the regex case-sensitive or not.
+
+    Returns:
+        re.Pattern: Compiled stripping pattern.
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(rf"https?://{re.escape(domain)}/?", flags)
+
+@st.cache_resource(show_spinner=False)
+def get_test_pattern(regex, flags):
+    """
+    Compile (and cache across reruns) the generated pattern for testing.
+
+    Args:
+        regex (str): Generated regex pattern.
+        flags (int): Flags to compile with.
+
+    Returns:
+        re.Pattern: Compiled test pattern (RE2-backed when available).
+    """
+    return _re.compile(regex, flags)
+
+@st.cache_data(show_spinner=False)
+def run_tests(regex, kind, flags, lines):
+    """
+    Match each test line against the generated pattern.
+
+    Cached across reruns, so toggling unrelated widgets skips the
+    rescanning entirely.
+
+    Args:
+        regex (str): Anchor-free pattern from :func:`build_regex_parts`.
+        kind (str): Match kind; picks ``fullmatch``/``match``/``search``.
+        flags (int): Flags to compile with.
+        lines (tuple of str): Pre-stripped test strings.
+
+    Returns:
+        tuple of bool: Whether each line matched.
+    """
+    if kind == "suffix":
+        # No suffix-anchored match method exists, so keep the "$".
+        regex = f"(?:{regex})$"
+    compiled = get_test_pattern(regex, flags)
+    if kind == "full":
+        matcher = compiled.fullmatch
+    elif kind == "prefix":
+        matcher = compiled.match
+    else:
+        matcher = compiled.search
+    return tuple(bool(matcher(line)) for line in lines)
+
+@st.cache_resource(show_spinner=False)
+def get_automaton(paths, case_sensitive):
+    """
+    Build (and cache across reruns) an Aho–Corasick automaton over the
+    stripped paths.
+
+    Args:
+        paths (tuple of str): Raw stripped paths from :func:`strip_paths`.
+        case_sensitive (bool): Whether matching is case-sensitive.
+
+    Returns:
+        ahocorasick.Automaton: Automaton ready for ``iter``.
+    """
+    automaton = ahocorasick.Automaton()
+    for path in paths:
+        word = path if case_sensitive else path.lower()
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+@st.cache_data(show_spinner=False)
+def run_substring_tests(paths, case_sensitive, lines):
+    """
+    Match each test line by multi-pattern substring search.
+
+    The stripped paths are fixed strings (metacharacters only appear
+    after escaping), so "match anywhere" is exactly what Aho–Corasick
+    answers in a single pass per line, with no backtracking.
+
+    Args:
+        paths (tuple of str): Raw stripped paths from :func:`strip_paths`.
+        case_sensitive (bool): Whether matching is case-sensitive.
+        lines (tuple of str): Pre-stripped test strings.
+
+    Returns:
+        tuple of bool: Whether each line contains any of the paths.
+    """
+    if any(not path for path in paths):
+        # An empty path (URL equal to the bare domain) matches any line.
+        return tuple(True for _ in lines)
+    automaton = get_automaton(paths, case_sensitive)
+    if not case_sensitive:
+        lines = tuple(line.lower() for line in lines)
+    return tuple(any(True for _ in automaton.iter(line)) for line in lines)
+
+def _write_trie(patterns, buf, terminal=False, separator="/"):
+    """
+    Recursively serialize pattern suffixes into a factored alternation,
+    writing pieces straight into ``buf`` rather than building (and
+    re-copying) an intermediate string per subtree. Patterns are sorted
+    by first segment and grouped with one contiguous ``groupby`` pass,
+    so output order is stable and no per-level dict is hashed.
+
+    Args:
+        patterns (list of str): Remaining pattern suffixes at this level.
+        buf (io.StringIO): Buffer the pattern is written into.
+        terminal (bool): Whether a pattern ends right before this level.
+        separator (str): Separator emitted before this level's segments.
+    """
+    if not patterns:
+        return
+    if terminal:
+        # A pattern is a prefix of others: make the rest optional.
+        buf.write("(?:")
+    buf.write(separator)
+    patterns.sort(key=lambda p: p.partition("/")[0])
+    children = []
+    for segment, items in groupby(patterns, key=lambda p: p.partition("/")[0]):
+        rests = []
+        ends_here = False
+        for item in items:
+            _, sep, rest = item.partition("/")
+            if sep:
+                rests.append(rest)
+            else:
+                ends_here = True
+        children.append((segment, rests, ends_here))
+    if len(children) > 1:
+        buf.write("(?:")
+    first = True
+    for segment, rests, ends_here in children:
+        if not first:
+            buf.write("|")
+        first = False
+        buf.write(segment)
+        _write_trie(rests, buf, terminal=ends_here)
+    if len(children) > 1:
+        buf.write(")")
+    if terminal:
+        buf.write(")?")
 
 def optimize_regex(patterns):
     """
-    Optimize regex patterns by grouping common prefixes and suffixes.
-    
+    Optimize regex patterns by factoring shared path prefixes with a trie.
+
+    Builds a segment trie over the patterns and emits a factored
+    alternation such as ``^/a(?:/b|/c)$``, so a backtracking engine can
+    prune whole subtrees instead of retrying every alternative.
+
     Args:
-        patterns (list of str): List of individual regex patterns.
+        patterns (iterable of str): Individual regex patterns with
+            ``/``-separated path segments.
 
     Returns:
         str: Optimized regex string.
     """
-    prefix_dict = defaultdict(list)
-    for pattern in patterns:
-        parts = pattern.split("/")
-        prefix = parts[0] if parts else ""
-        prefix_dict[prefix].append(pattern)
-    
-    optimized_patterns = []
-    for prefix, paths in prefix_dict.items():
-        if len(paths) > 1:
-            suffixes = [p[len(prefix):] for p in paths]
-            optimized_patterns.append(f"{prefix}({ '|'.join(suffixes) })")
-        else:
-            optimized_patterns.append(paths[0])
-    
-    return "|".join(optimized_patterns)
+    patterns = list(patterns)
+    if len(patterns) <= 1:
+        return patterns[0] if patterns else ""
+    # Cheap O(N) probe: when no two patterns can share a first segment,
+    # the trie would just re-join them, so skip building it.
+    heads = {p[:1] for p in patterns}
+    if len(heads) == len(patterns):
+        return "|".join(patterns)
+    buf = io.StringIO()
+    _write_trie(patterns, buf, separator="")
+    return buf.getvalue()
 
-def build_regex(urls, domain, wild_start=False, wild_end=False, case_sensitive=True, negative_match=False):
+@st.cache_data(show_spinner=False)
+def build_regex_parts(urls, domain, wild_start=False, wild_end=False, case_sensitive=True):
     """
-    Builds regex patterns based on user preferences and optimizes them.
+    Builds the positive (non-negated) regex pattern and optimizes it.
+    Results are cached across Streamlit reruns, so toggling unrelated
+    widgets doesn't rebuild the pattern; pass ``urls`` as a tuple.
+
+    The returned pattern carries no ``^``/``$`` anchors; how it should
+    be matched is described by the accompanying kind, which lets the
+    tester use ``fullmatch``/``match`` directly and lets the optimizer
+    factor common prefixes without per-branch anchors in the way.
+
+    Duplicate URLs (after stripping) collapse to a single branch.
+    Negation is left to the caller: matching against this pattern and
+    inverting the result is far cheaper than a ``(?!...)``  lookahead
+    that rescans the whole alternation at every position.
 
     Args:
         urls (list of str): List of URLs.
@@ -38,33 +260,128 @@ def build_regex(urls, domain, wild_start=False, wild_end=False, case_sensitive=T
         wild_start (bool): Add wildcards at the start of the regex.
         wild_end (bool): Add wildcards at the end of the regex.
         case_sensitive (bool): Make the regex case-sensitive or not.
-        negative_match (bool): Create a negative match regex.
 
     Returns:
-        str: Generated and optimized regex pattern.
+        tuple: ``(pattern, kind)`` where kind is one of ``"full"``,
+        ``"prefix"``, ``"suffix"`` or ``"search"``, derived from the
+        wildcard flags.
     """
-    flags = 0 if case_sensitive else re.IGNORECASE
-    
+    # Escape, then anchor-free branches go through the optimizer.
+    stripped_paths = [p.translate(_ESCAPE_TABLE) for p in strip_paths(urls, domain, case_sensitive)]
+
+    if wild_start:
+        kind = "search" if wild_end else "suffix"
+    else:
+        kind = "prefix" if wild_end else "full"
+    return optimize_regex(stripped_paths), kind
+
+@st.cache_data(show_spinner=False)
+def strip_paths(urls, domain, case_sensitive=True):
+    """
+    Strip the protocol and domain off each URL.
+
+    Duplicates collapse (order preserved) and the returned paths are
+    raw, unescaped strings; pass ``urls`` as a tuple.
+
+    Args:
+        urls (tuple of str): URLs to strip.
+        domain (str): Domain to strip from the URLs.
+        case_sensitive (bool): Whether prefix matching is case-sensitive.
+
+    Returns:
+        tuple of str: Stripped paths.
+    """
+    stripper = get_domain_stripper(domain, case_sensitive)
+    prefixes = ("https://" + domain, "http://" + domain)
+    if not case_sensitive:
+        prefixes = tuple(p.lower() for p in prefixes)
+
+    domain_host = domain.lower()
+
     stripped_paths = []
+    fallback_slots = []  # indices still waiting on the regex fallback
     for url in urls:
-        stripped_url = re.sub(rf"https?://{re.escape(domain)}/?", "", url.strip(), flags=flags)
-        stripped_paths.append(stripped_url)
-    
-    regex_parts = []
-    for path in stripped_paths:
-        if not wild_start:
-            path = "^" + path.lstrip("/")  # Ensure no leading slash in regex
-        if not wild_end:
-            path += "$"
-        regex_parts.append(path)
-    
-    optimized_regex = optimize_regex(regex_parts)
-    optimized_regex = optimized_regex.replace("/", r"\/")
-    
+        url = url.strip()
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            parts = None
+        if parts is not None and parts.scheme in ("http", "https") and parts.hostname == domain_host:
+            # Exact host match: take the parsed path directly, no regex.
+            # urlsplit also handles ports and userinfo for free.
+            rest = parts.path.lstrip("/")
+            if parts.query:
+                rest += "?" + parts.query
+            if parts.fragment:
+                rest += "#" + parts.fragment
+            stripped_paths.append(rest)
+            continue
+        probe = url if case_sensitive else url.lower()
+        stripped, matched = _strip_prefix(url, probe, prefixes[0], prefixes[1])
+        if matched:
+            stripped_paths.append(stripped)
+        else:
+            fallback_slots.append(len(stripped_paths))
+            stripped_paths.append(url.replace("\n", ""))
+
+    if fallback_slots:
+        # One trip through the regex engine for every fallback URL at once:
+        # join them on newlines, sub, and split the results back out.
+        blob = "\n".join(stripped_paths[i] for i in fallback_slots)
+        for i, stripped in zip(fallback_slots, stripper.sub("", blob).split("\n")):
+            stripped_paths[i] = stripped.lstrip("/")
+
+    # Drop duplicates while preserving order so repeated hits (e.g. pasted
+    # log lines) don't inflate the alternation.
+    return tuple(dict.fromkeys(stripped_paths))
+
+def anchor_pattern(pattern, kind):
+    """
+    Wrap an anchor-free pattern into a standalone regex for export.
+
+    Args:
+        pattern (str): Pattern from :func:`build_regex_parts`.
+        kind (str): One of ``"full"``, ``"prefix"``, ``"suffix"``,
+            ``"search"``.
+
+    Returns:
+        str: Pattern with the anchors the kind implies.
+    """
+    if kind == "full":
+        return f"^(?:{pattern})$"
+    if kind == "prefix":
+        return f"^(?:{pattern})"
+    if kind == "suffix":
+        return f"(?:{pattern})$"
+    return pattern
+
+def build_regex(urls, domain, wild_start=False, wild_end=False, case_sensitive=True, negative_match=False, escape_slashes=False):
+    """
+    Builds the full regex string for display/export.
+
+    Args:
+        urls (list of str): List of URLs.
+        domain (str): Domain to strip from the URLs.
+        wild_start (bool): Add wildcards at the start of the regex.
+        wild_end (bool): Add wildcards at the end of the regex.
+        case_sensitive (bool): Make the regex case-sensitive or not.
+        negative_match (bool): Create a negative match regex.
+        escape_slashes (bool): Escape ``/`` as ``\\/`` for consumers
+            (JS, PCRE-with-delimiters) that require it. Python's own
+            engine treats ``/`` as a literal, so this is off by default.
+
+    Returns:
+        str: Generated and optimized regex pattern, wrapped in a
+        negative lookahead when ``negative_match`` is set so consumers
+        get a single standalone regex.
+    """
+    pattern, kind = build_regex_parts(tuple(urls), domain, wild_start, wild_end, case_sensitive)
+    pattern = anchor_pattern(pattern, kind)
     if negative_match:
-        optimized_regex = f"^(?!{optimized_regex}).*$"
-    
-    return optimized_regex
+        pattern = f"^(?!{pattern}).*$"
+    if escape_slashes:
+        pattern = pattern.replace("/", r"\/")
+    return pattern
 
 # Streamlit App
 st.title("Regex Generator for URL Matching")
@@ -80,6 +397,7 @@ with st.expander("Instructions: How to Use This App"):
        - **Wildcard Options**: Enable partial matching at the start or end.
        - **Case Sensitivity**: Enable/Disable case-sensitive matching.
        - **Negative Match**: Exclude URLs that match the patterns.
+       - **Slash Escaping**: Escape `/` as `\/` for tools that need it (JS, PCRE with delimiters).
     3. **Generate and Test the Regex**.
     """)
 
@@ -90,7 +408,7 @@ url_input = st.text_area(
     placeholder="https://example.com/path1\nhttp://example.com/path2\nhttps://example.com/path3",
     height=200
 )
-urls = url_input.splitlines() if url_input.strip() else []
+urls = tuple(url_input.splitlines()) if url_input.strip() else ()
 
 if urls:
     st.success(f"Detected {len(urls)} URLs.")
@@ -100,9 +418,15 @@ if urls:
     wild_end = st.checkbox("Allow wildcard matching at the end of the string", value=False)
     case_sensitive = st.checkbox("Case-sensitive matching", value=True)
     negative_match = st.checkbox("Generate a negative match regex", value=False)
+    escape_slashes = st.checkbox("Escape forward slashes (for JS/PCRE tools)", value=False)
 
     if domain:
-        regex = build_regex(urls, domain, wild_start, wild_end, case_sensitive, negative_match)
+        pattern, kind = build_regex_parts(urls, domain, wild_start, wild_end, case_sensitive)
+        regex = anchor_pattern(pattern, kind)
+        if negative_match:
+            regex = f"^(?!{regex}).*$"
+        if escape_slashes:
+            regex = regex.replace("/", r"\/")
         st.subheader("Generated Regex:")
         st.code(regex)
 
@@ -110,11 +434,22 @@ if urls:
         test_strings = st.text_area("Enter test strings (one per line):", height=150)
         if test_strings.strip():
             st.write("### Test Results:")
-            test_results = []
             flags = 0 if case_sensitive else re.IGNORECASE
-            for test_string in test_strings.splitlines():
-                match = re.search(regex, test_string.strip(), flags=flags)
-                test_results.append(f"✅ `{test_string.strip()}`" if match else f"❌ `{test_string.strip()}`")
-            st.text("\n".join(test_results))
+            lines = tuple(s.strip() for s in test_strings.splitlines() if s.strip())
+            try:
+                # Test against the positive pattern and invert the result
+                # for negative matches, instead of compiling the lookahead.
+                if kind == "search" and ahocorasick is not None:
+                    hits = run_substring_tests(strip_paths(urls, domain, case_sensitive), case_sensitive, lines)
+                else:
+                    hits = run_tests(pattern, kind, flags, lines)
+            except (re.error, _re.error) as e:
+                st.error(f"The generated regex failed to compile: {e}")
+            else:
+                test_results = [
+                    f"✅ `{line}`" if hit != negative_match else f"❌ `{line}`"
+                    for line, hit in zip(lines, hits)
+                ]
+                st.text("\n".join(test_results))
 
 
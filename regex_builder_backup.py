@@ -1,5 +1,27 @@
 import re
 import streamlit as st
+from urllib.parse import urlsplit
+
+# Translation table escaping every regex metacharacter in one C-level pass,
+# instead of per-character re.escape. "/" is not a metacharacter in Python
+# regexes and is left alone.
+_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in ".^$*+?()[]{}|\\"})
+
+@st.cache_resource(show_spinner=False)
+def get_domain_stripper(domain, case_sensitive):
+    """
+    Compile (and cache across reruns) the regex that strips the protocol
+    and domain from a URL.
+
+    Args:
+        domain (str): Domain to strip from the URLs.
+        case_sensitive (bool): Make the regex case-sensitive or not.
+
+    Returns:
+        re.Pattern: Compiled stripping pattern.
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(rf"https?://{re.escape(domain)}/?", flags)
 
 def build_regex(urls, domain, wild_start=False, wild_end=False, case_sensitive=True, negative_match=False):
     """
@@ -16,16 +38,42 @@ def build_regex(urls, domain, wild_start=False, wild_end=False, case_sensitive=T
     Returns:
         str: Generated regex pattern.
     """
-    flags = 0 if case_sensitive else re.IGNORECASE
+    stripper = get_domain_stripper(domain, case_sensitive)
+    prefixes = ("https://" + domain, "http://" + domain)
+    if not case_sensitive:
+        prefixes = tuple(p.lower() for p in prefixes)
+
+    domain_host = domain.lower()
 
     stripped_paths = []
     for url in urls:
-        stripped_url = re.sub(rf"https?://{re.escape(domain)}/?", "", url.strip(), flags=flags)
+        url = url.strip()
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            parts = None
+        if parts is not None and parts.scheme in ("http", "https") and parts.hostname == domain_host:
+            # Exact host match: take the parsed path directly, no regex.
+            # urlsplit also handles ports and userinfo for free.
+            stripped_url = parts.path or "/"
+            if parts.query:
+                stripped_url += "?" + parts.query
+            if parts.fragment:
+                stripped_url += "#" + parts.fragment
+        else:
+            probe = url if case_sensitive else url.lower()
+            for prefix in prefixes:
+                if probe.startswith(prefix):
+                    stripped_url = url[len(prefix):].lstrip("/")
+                    break
+            else:
+                # Fall back to the regex for anything the plain prefix check misses
+                stripped_url = stripper.sub("", url)
         # Ensure paths start with a "/"
         if not stripped_url.startswith("/"):
             stripped_url = "/" + stripped_url
-        # Escape slashes but leave dashes unescaped
-        stripped_url = stripped_url.replace("/", r"\/")
+        # Escape metacharacters but leave slashes and dashes unescaped
+        stripped_url = stripped_url.translate(_ESCAPE_TABLE)
         stripped_paths.append(stripped_url)
 
     regex_parts = []